@@ -8,6 +8,7 @@ import json
 import os
 import psycopg2
 from typing import Dict, Any
+from read_routing import connect_for_read, write_lsn, write_headers
 
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     method: str = event.get('httpMethod', 'GET')
@@ -18,7 +19,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'headers': {
                 'Access-Control-Allow-Origin': '*',
                 'Access-Control-Allow-Methods': 'GET, POST, PUT, OPTIONS',
-                'Access-Control-Allow-Headers': 'Content-Type, X-User-Id',
+                'Access-Control-Allow-Headers': 'Content-Type, X-User-Id, X-Read-After-Lsn',
                 'Access-Control-Max-Age': '86400'
             },
             'body': ''
@@ -34,7 +35,10 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'body': json.dumps({'error': 'User ID required'})
         }
     
-    conn = psycopg2.connect(os.environ['DATABASE_URL'])
+    if method == 'GET':
+        conn = connect_for_read(event)
+    else:
+        conn = psycopg2.connect(os.environ['DATABASE_URL'])
     cur = conn.cursor()
     
     cur.execute("SELECT role FROM users WHERE id = %s", (user_id,))
@@ -104,6 +108,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         )
         course = cur.fetchone()
         conn.commit()
+        lsn = write_lsn(conn)
         
         result = {
             'id': course[0],
@@ -119,7 +124,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         
         return {
             'statusCode': 201,
-            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*', **write_headers(lsn)},
             'isBase64Encoded': False,
             'body': json.dumps(result)
         }
@@ -144,6 +149,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         
         updates = []
         params = []
+        lsn = None
         
         if title is not None:
             updates.append("title = %s")
@@ -169,6 +175,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             cur.execute(query, params)
             course = cur.fetchone()
             conn.commit()
+            lsn = write_lsn(conn)
             
             result = {
                 'id': course[0],
@@ -183,7 +190,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         
         return {
             'statusCode': 200,
-            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*', **write_headers(lsn)},
             'isBase64Encoded': False,
             'body': json.dumps(result)
         }
@@ -8,6 +8,7 @@ import json
 import os
 import psycopg2
 from typing import Dict, Any
+from read_routing import write_lsn, write_headers
 
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     method: str = event.get('httpMethod', 'GET')
@@ -75,6 +76,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         )
         lesson = cur.fetchone()
         conn.commit()
+        lsn = write_lsn(conn)
         
         result = {
             'id': lesson[0],
@@ -91,7 +93,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         
         return {
             'statusCode': 201,
-            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*', **write_headers(lsn)},
             'isBase64Encoded': False,
             'body': json.dumps(result)
         }
@@ -116,6 +118,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         
         updates = []
         params = []
+        lsn = None
         
         if title is not None:
             updates.append("title = %s")
@@ -139,6 +142,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             cur.execute(query, params)
             lesson = cur.fetchone()
             conn.commit()
+            lsn = write_lsn(conn)
             
             result = {
                 'id': lesson[0],
@@ -152,7 +156,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         
         return {
             'statusCode': 200,
-            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*', **write_headers(lsn)},
             'isBase64Encoded': False,
             'body': json.dumps(result)
         }
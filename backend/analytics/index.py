@@ -0,0 +1,138 @@
+'''
+Business: Admin API for learning activity trends and per-lesson completion funnels
+Args: event with httpMethod GET, queryStringParameters with days or courseId
+Returns: Daily activity series, or lessons of a course with learners and average time to complete
+'''
+
+import json
+from typing import Dict, Any
+
+from read_routing import connect_for_read
+
+def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    method: str = event.get('httpMethod', 'GET')
+
+    if method == 'OPTIONS':
+        return {
+            'statusCode': 200,
+            'headers': {
+                'Access-Control-Allow-Origin': '*',
+                'Access-Control-Allow-Methods': 'GET, OPTIONS',
+                'Access-Control-Allow-Headers': 'Content-Type, X-User-Id, X-Read-After-Lsn',
+                'Access-Control-Max-Age': '86400'
+            },
+            'body': ''
+        }
+
+    headers_dict = event.get('headers', {})
+    user_id = headers_dict.get('X-User-Id') or headers_dict.get('x-user-id')
+
+    if not user_id:
+        return {
+            'statusCode': 401,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({'error': 'User ID required'})
+        }
+
+    if method != 'GET':
+        return {
+            'statusCode': 405,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({'error': 'Method not allowed'})
+        }
+
+    conn = connect_for_read(event)
+    cur = conn.cursor()
+
+    cur.execute("SELECT role FROM users WHERE id = %s", (user_id,))
+    user = cur.fetchone()
+
+    if not user or user[0] != 'admin':
+        cur.close()
+        conn.close()
+        return {
+            'statusCode': 403,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({'error': 'Admin access required'})
+        }
+
+    params = event.get('queryStringParameters', {}) or {}
+    course_id = params.get('courseId')
+
+    if course_id and not course_id.isdigit():
+        cur.close()
+        conn.close()
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({'error': 'courseId must be a number'})
+        }
+
+    if course_id:
+        cur.execute(
+            """SELECT l.id, l.title, l.order_index,
+                      COALESCE(SUM(r.completions), 0) as completions,
+                      COALESCE(SUM(r.new_learners), 0) as learners,
+                      COALESCE(SUM(r.total_seconds_to_complete), 0) as total_seconds
+               FROM lessons l
+               LEFT JOIN lesson_daily_rollup r ON r.lesson_id = l.id
+               WHERE l.course_id = %s
+               GROUP BY l.id, l.title, l.order_index
+               ORDER BY l.order_index""",
+            (course_id,)
+        )
+        rows = cur.fetchall()
+
+        result = []
+        previous_learners = None
+        for r in rows:
+            learners = int(r[4])
+            result.append({
+                'lessonId': r[0],
+                'title': r[1],
+                'orderIndex': r[2],
+                'completions': int(r[3]),
+                'learners': learners,
+                'avgSecondsToComplete': round(int(r[5]) / learners) if learners else None,
+                'dropOffPercent': round((previous_learners - learners) * 100 / previous_learners)
+                                  if previous_learners else None
+            })
+            previous_learners = learners
+    else:
+        try:
+            days = min(max(int(params.get('days', 30)), 1), 366)
+        except ValueError:
+            cur.close()
+            conn.close()
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'error': 'days must be a number'})
+            }
+
+        cur.execute(
+            """SELECT day, active_learners, logins, course_views, lesson_completions
+               FROM activity_daily_rollup
+               WHERE day > CURRENT_DATE - %s
+               ORDER BY day""",
+            (days,)
+        )
+        rows = cur.fetchall()
+
+        result = [{
+            'day': r[0].isoformat(),
+            'activeLearners': r[1],
+            'logins': r[2],
+            'courseViews': r[3],
+            'lessonCompletions': r[4]
+        } for r in rows]
+
+    cur.close()
+    conn.close()
+
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'isBase64Encoded': False,
+        'body': json.dumps(result)
+    }
@@ -0,0 +1,66 @@
+'''
+Business: Route read-only requests to the DATABASE_READ_URL replica with read-your-writes
+Args: event whose X-Read-After-Lsn header carries the WAL position of the caller's last write
+Returns: Replica connection when it is reachable and has replayed that position, primary connection otherwise
+'''
+
+import os
+import psycopg2
+from typing import Dict, Any, Optional
+
+READ_AFTER_HEADER = 'X-Read-After-Lsn'
+WRITE_LSN_HEADER = 'X-Write-Lsn'
+
+
+def connect_for_read(event: Dict[str, Any]) -> Any:
+    read_url = os.environ.get('DATABASE_READ_URL')
+    if not read_url:
+        return psycopg2.connect(os.environ['DATABASE_URL'])
+
+    headers_dict = event.get('headers', {}) or {}
+    read_after = headers_dict.get(READ_AFTER_HEADER) or headers_dict.get(READ_AFTER_HEADER.lower())
+
+    try:
+        conn = psycopg2.connect(read_url)
+    except psycopg2.OperationalError:
+        # The replica is optional: reads keep working on the primary while it is down or restarting
+        return psycopg2.connect(os.environ['DATABASE_URL'])
+
+    if not read_after:
+        return conn
+
+    cur = conn.cursor()
+    try:
+        cur.execute(
+            "SELECT NOT pg_is_in_recovery() OR pg_last_wal_replay_lsn() >= %s::pg_lsn",
+            (read_after,)
+        )
+        caught_up = cur.fetchone()[0]
+    except psycopg2.DataError:
+        caught_up = False
+    cur.close()
+    conn.rollback()
+
+    if caught_up:
+        return conn
+
+    conn.close()
+    return psycopg2.connect(os.environ['DATABASE_URL'])
+
+
+def write_lsn(conn: Any) -> Optional[str]:
+    '''WAL position after the last commit on a primary connection, when a replica is configured.'''
+    if not os.environ.get('DATABASE_READ_URL'):
+        return None
+    cur = conn.cursor()
+    cur.execute("SELECT pg_current_wal_lsn()::text")
+    lsn = cur.fetchone()[0]
+    cur.close()
+    conn.rollback()
+    return lsn
+
+
+def write_headers(lsn: Optional[str]) -> Dict[str, str]:
+    if not lsn:
+        return {}
+    return {WRITE_LSN_HEADER: lsn, 'Access-Control-Expose-Headers': WRITE_LSN_HEADER}
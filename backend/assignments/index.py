@@ -0,0 +1,204 @@
+'''
+Business: Admin API to assign mandatory courses to departments
+Args: event with httpMethod, body with courseId, department and dueDate for POST, userIds and department for PUT
+Returns: Number of new enrollments, assignment summary or number of users moved to the department
+'''
+
+import json
+import os
+import psycopg2
+from datetime import date
+from typing import Dict, Any
+
+def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    method: str = event.get('httpMethod', 'GET')
+
+    if method == 'OPTIONS':
+        return {
+            'statusCode': 200,
+            'headers': {
+                'Access-Control-Allow-Origin': '*',
+                'Access-Control-Allow-Methods': 'GET, POST, PUT, OPTIONS',
+                'Access-Control-Allow-Headers': 'Content-Type, X-User-Id',
+                'Access-Control-Max-Age': '86400'
+            },
+            'body': ''
+        }
+
+    headers_dict = event.get('headers', {})
+    user_id = headers_dict.get('X-User-Id') or headers_dict.get('x-user-id')
+
+    if not user_id:
+        return {
+            'statusCode': 401,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({'error': 'User ID required'})
+        }
+
+    conn = psycopg2.connect(os.environ['DATABASE_URL'])
+    cur = conn.cursor()
+
+    cur.execute("SELECT role FROM users WHERE id = %s", (user_id,))
+    user = cur.fetchone()
+
+    if not user or user[0] != 'admin':
+        cur.close()
+        conn.close()
+        return {
+            'statusCode': 403,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({'error': 'Admin access required'})
+        }
+
+    if method == 'GET':
+        params = event.get('queryStringParameters', {}) or {}
+        course_id = params.get('courseId')
+
+        if not course_id:
+            cur.close()
+            conn.close()
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'error': 'courseId required'})
+            }
+
+        cur.execute(
+            """SELECT u.department,
+                      COUNT(*) as assigned_count,
+                      COUNT(ucp.started_at) as started_count,
+                      COUNT(*) FILTER (WHERE ucp.progress_percent = 100) as completed_count,
+                      MIN(ucp.due_date) as due_date
+               FROM user_course_progress ucp
+               JOIN users u ON ucp.user_id = u.id
+               WHERE ucp.course_id = %s AND ucp.is_mandatory = true
+               GROUP BY u.department
+               ORDER BY u.department""",
+            (course_id,)
+        )
+        rows = cur.fetchall()
+
+        result = [{
+            'department': r[0],
+            'assignedCount': r[1],
+            'startedCount': r[2],
+            'completedCount': r[3],
+            'dueDate': r[4].isoformat() if r[4] else None
+        } for r in rows]
+
+        cur.close()
+        conn.close()
+
+        return {
+            'statusCode': 200,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'isBase64Encoded': False,
+            'body': json.dumps(result)
+        }
+
+    if method == 'POST':
+        body_data = json.loads(event.get('body', '{}'))
+        course_id = body_data.get('courseId')
+        department = body_data.get('department')
+        due_date = body_data.get('dueDate')
+
+        if not course_id or not department:
+            cur.close()
+            conn.close()
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'error': 'courseId and department required'})
+            }
+
+        if due_date is not None:
+            try:
+                date.fromisoformat(due_date)
+            except (TypeError, ValueError):
+                cur.close()
+                conn.close()
+                return {
+                    'statusCode': 400,
+                    'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                    'body': json.dumps({'error': 'dueDate must be YYYY-MM-DD'})
+                }
+
+        cur.execute("SELECT id FROM courses WHERE id = %s", (course_id,))
+        if not cur.fetchone():
+            cur.close()
+            conn.close()
+            return {
+                'statusCode': 404,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'error': 'Course not found'})
+            }
+
+        cur.execute(
+            """INSERT INTO user_course_progress
+                   (user_id, course_id, assigned_at, assigned_by, due_date, is_mandatory)
+               SELECT u.id, %s, CURRENT_TIMESTAMP, %s, %s, true
+               FROM users u
+               WHERE u.department = %s AND u.is_active = true
+               ON CONFLICT (user_id, course_id) DO UPDATE SET
+                   is_mandatory = true,
+                   due_date = EXCLUDED.due_date,
+                   assigned_at = EXCLUDED.assigned_at,
+                   assigned_by = EXCLUDED.assigned_by
+               WHERE user_course_progress.is_mandatory IS NOT TRUE
+                  OR user_course_progress.due_date IS DISTINCT FROM EXCLUDED.due_date""",
+            (course_id, user_id, due_date, department)
+        )
+        assigned = cur.rowcount
+        conn.commit()
+
+        cur.close()
+        conn.close()
+
+        return {
+            'statusCode': 200,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'isBase64Encoded': False,
+            'body': json.dumps({
+                'courseId': course_id,
+                'department': department,
+                'dueDate': due_date,
+                'assigned': assigned
+            })
+        }
+
+    if method == 'PUT':
+        body_data = json.loads(event.get('body', '{}'))
+        user_ids = body_data.get('userIds')
+        department = (body_data.get('department') or '').strip() or None
+
+        if not isinstance(user_ids, list) or not user_ids or not all(isinstance(i, int) for i in user_ids):
+            cur.close()
+            conn.close()
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'error': 'userIds must be a non-empty list of ids'})
+            }
+
+        cur.execute(
+            "UPDATE users SET department = %s WHERE id = ANY(%s) AND department IS DISTINCT FROM %s",
+            (department, user_ids, department)
+        )
+        updated = cur.rowcount
+        conn.commit()
+
+        cur.close()
+        conn.close()
+
+        return {
+            'statusCode': 200,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'isBase64Encoded': False,
+            'body': json.dumps({'userIds': user_ids, 'department': department, 'updated': updated})
+        }
+
+    return {
+        'statusCode': 405,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': json.dumps({'error': 'Method not allowed'})
+    }
@@ -8,6 +8,13 @@ import json
 import os
 import psycopg2
 from typing import Dict, Any
+from sql_registry import StatementRegistry
+
+STATEMENTS = StatementRegistry({
+    'auth_user_by_phone': "SELECT id, phone, full_name, role FROM users WHERE phone = $1 AND is_active = true",
+    'auth_touch_login': "UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE id = $1",
+    'auth_log_login': "INSERT INTO learning_events (user_id, event_type) VALUES ($1, 'login')"
+})
 
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     method: str = event.get('httpMethod', 'GET')
@@ -38,17 +45,12 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         conn = psycopg2.connect(os.environ['DATABASE_URL'])
         cur = conn.cursor()
         
-        cur.execute(
-            "SELECT id, phone, full_name, role FROM users WHERE phone = %s",
-            (phone,)
-        )
+        STATEMENTS.execute(conn, cur, 'auth_user_by_phone', (phone,))
         user = cur.fetchone()
         
         if user:
-            cur.execute(
-                "UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE id = %s",
-                (user[0],)
-            )
+            STATEMENTS.execute(conn, cur, 'auth_touch_login', (user[0],))
+            STATEMENTS.execute(conn, cur, 'auth_log_login', (user[0],))
             conn.commit()
             
             result = {
@@ -0,0 +1,78 @@
+'''
+Business: Buffered writer for the append-only learning_events table
+Args: record() takes user id, event type and optional course and lesson ids; flush() takes a connect function
+Returns: Pending events written with one multi-row INSERT per flush, kept for the next flush if it fails
+'''
+
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, List, Optional, Tuple
+
+FLUSH_SIZE = 100
+FLUSH_INTERVAL_SECONDS = 5.0
+MAX_PENDING = 10000
+
+
+class ActivityLog:
+    def __init__(self):
+        self._pending: List[Tuple[int, str, Optional[int], Optional[int], datetime]] = []
+        self._oldest: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def record(self, user_id: Any, event_type: str, course_id: Any = None, lesson_id: Any = None) -> None:
+        try:
+            event = (
+                int(user_id),
+                event_type,
+                int(course_id) if course_id is not None else None,
+                int(lesson_id) if lesson_id is not None else None,
+                datetime.now(timezone.utc)
+            )
+        except (TypeError, ValueError):
+            return
+
+        with self._lock:
+            if len(self._pending) >= MAX_PENDING:
+                return
+            if not self._pending:
+                self._oldest = time.monotonic()
+            self._pending.append(event)
+
+    def due(self) -> bool:
+        '''Whether buffered events should be written now.'''
+        with self._lock:
+            if not self._pending:
+                return False
+            return len(self._pending) >= FLUSH_SIZE or time.monotonic() - self._oldest >= FLUSH_INTERVAL_SECONDS
+
+    def flush(self, connect: Callable[[], Any]) -> int:
+        '''Write all buffered events in their own transaction on a connection from connect().
+
+        On failure the events go back to the buffer, still bounded by MAX_PENDING, and the error is raised.
+        '''
+        with self._lock:
+            events, self._pending, self._oldest = self._pending, [], None
+        if not events:
+            return 0
+
+        conn = None
+        try:
+            conn = connect()
+            cur = conn.cursor()
+            values = ', '.join(['(%s, %s, %s, %s, %s)'] * len(events))
+            cur.execute(
+                "INSERT INTO learning_events (user_id, event_type, course_id, lesson_id, occurred_at) VALUES " + values,
+                [value for event in events for value in event]
+            )
+            conn.commit()
+            cur.close()
+        except Exception:
+            with self._lock:
+                self._pending = (events + self._pending)[:MAX_PENDING]
+                self._oldest = time.monotonic()
+            raise
+        finally:
+            if conn is not None:
+                conn.close()
+        return len(events)
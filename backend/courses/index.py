@@ -8,6 +8,30 @@ import json
 import os
 import psycopg2
 from typing import Dict, Any
+from sql_registry import StatementRegistry
+from read_routing import connect_for_read
+from activity_log import ActivityLog
+
+STATEMENTS = StatementRegistry({
+    'courses_detail': """SELECT c.id, c.title, c.description, c.cover_image, c.duration_hours, c.is_published,
+                                u.full_name as creator_name
+                         FROM courses c
+                         LEFT JOIN users u ON c.created_by = u.id
+                         WHERE c.id = $1""",
+    'courses_lessons': """SELECT id, title, content_type, content_data, order_index, duration_minutes
+                          FROM lessons
+                          WHERE course_id = $1
+                          ORDER BY order_index""",
+    'courses_catalog': """SELECT c.id, c.title, c.description, c.cover_image, c.duration_hours,
+                                 COUNT(l.id) as lessons_count
+                          FROM courses c
+                          LEFT JOIN lessons l ON c.id = l.course_id
+                          WHERE c.is_published = true
+                          GROUP BY c.id
+                          ORDER BY c.created_at DESC"""
+})
+
+ACTIVITY = ActivityLog()
 
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     method: str = event.get('httpMethod', 'GET')
@@ -18,7 +42,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'headers': {
                 'Access-Control-Allow-Origin': '*',
                 'Access-Control-Allow-Methods': 'GET, OPTIONS',
-                'Access-Control-Allow-Headers': 'Content-Type',
+                'Access-Control-Allow-Headers': 'Content-Type, X-User-Id, X-Read-After-Lsn',
                 'Access-Control-Max-Age': '86400'
             },
             'body': ''
@@ -28,18 +52,11 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         params = event.get('queryStringParameters', {}) or {}
         course_id = params.get('id')
         
-        conn = psycopg2.connect(os.environ['DATABASE_URL'])
+        conn = connect_for_read(event)
         cur = conn.cursor()
         
         if course_id:
-            cur.execute(
-                """SELECT c.id, c.title, c.description, c.cover_image, c.duration_hours, c.is_published,
-                          u.full_name as creator_name
-                   FROM courses c
-                   LEFT JOIN users u ON c.created_by = u.id
-                   WHERE c.id = %s""",
-                (course_id,)
-            )
+            STATEMENTS.execute(conn, cur, 'courses_detail', (course_id,))
             course = cur.fetchone()
             
             if not course:
@@ -51,15 +68,14 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                     'body': json.dumps({'error': 'Course not found'})
                 }
             
-            cur.execute(
-                """SELECT id, title, content_type, content_data, order_index, duration_minutes
-                   FROM lessons
-                   WHERE course_id = %s
-                   ORDER BY order_index""",
-                (course_id,)
-            )
+            STATEMENTS.execute(conn, cur, 'courses_lessons', (course_id,))
             lessons = cur.fetchall()
             
+            headers_dict = event.get('headers', {}) or {}
+            user_id = headers_dict.get('X-User-Id') or headers_dict.get('x-user-id')
+            if user_id:
+                ACTIVITY.record(user_id, 'course_view', course[0])
+            
             result = {
                 'id': course[0],
                 'title': course[1],
@@ -78,15 +94,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 } for l in lessons]
             }
         else:
-            cur.execute(
-                """SELECT c.id, c.title, c.description, c.cover_image, c.duration_hours,
-                          COUNT(l.id) as lessons_count
-                   FROM courses c
-                   LEFT JOIN lessons l ON c.id = l.course_id
-                   WHERE c.is_published = true
-                   GROUP BY c.id
-                   ORDER BY c.created_at DESC"""
-            )
+            STATEMENTS.execute(conn, cur, 'courses_catalog')
             courses = cur.fetchall()
             
             result = [{
@@ -101,6 +109,13 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         cur.close()
         conn.close()
         
+        if ACTIVITY.due():
+            # Reads may run on a replica, so buffered events go to the primary in one batch
+            try:
+                ACTIVITY.flush(lambda: psycopg2.connect(os.environ['DATABASE_URL']))
+            except psycopg2.Error as e:
+                print(f'Activity log flush failed, events kept for the next request: {e}')
+        
         return {
             'statusCode': 200,
             'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
@@ -0,0 +1,329 @@
+'''
+Business: Admin API for lesson progress partitioning, user retention and activity rollups
+Args: event with httpMethod, body with action (backfill, swap, deactivate, archive or rollup) and its options
+Returns: Rows processed by the batch and whether more work remains
+'''
+
+import json
+import os
+import psycopg2
+from typing import Dict, Any
+
+def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    method: str = event.get('httpMethod', 'GET')
+
+    if method == 'OPTIONS':
+        return {
+            'statusCode': 200,
+            'headers': {
+                'Access-Control-Allow-Origin': '*',
+                'Access-Control-Allow-Methods': 'POST, OPTIONS',
+                'Access-Control-Allow-Headers': 'Content-Type, X-User-Id',
+                'Access-Control-Max-Age': '86400'
+            },
+            'body': ''
+        }
+
+    headers_dict = event.get('headers', {})
+    user_id = headers_dict.get('X-User-Id') or headers_dict.get('x-user-id')
+
+    if not user_id:
+        return {
+            'statusCode': 401,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({'error': 'User ID required'})
+        }
+
+    if method != 'POST':
+        return {
+            'statusCode': 405,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({'error': 'Method not allowed'})
+        }
+
+    conn = psycopg2.connect(os.environ['DATABASE_URL'])
+    cur = conn.cursor()
+
+    cur.execute("SELECT role FROM users WHERE id = %s", (user_id,))
+    user = cur.fetchone()
+
+    if not user or user[0] != 'admin':
+        cur.close()
+        conn.close()
+        return {
+            'statusCode': 403,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({'error': 'Admin access required'})
+        }
+
+    body_data = json.loads(event.get('body', '{}'))
+    action = body_data.get('action')
+    batch_size = int(body_data.get('batchSize', 5000))
+
+    if action in ('backfill', 'swap'):
+        cur.execute("SELECT to_regclass('user_lesson_progress_partitioned')")
+        if cur.fetchone()[0] is None:
+            cur.close()
+            conn.close()
+            return {
+                'statusCode': 409,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'error': 'user_lesson_progress is already partitioned'})
+            }
+
+    if action == 'backfill':
+        after_id = int(body_data.get('afterId', 0))
+
+        cur.execute(
+            """WITH batch AS (
+                   SELECT id, user_id, lesson_id, completed, completed_at
+                   FROM user_lesson_progress
+                   WHERE id > %s
+                   ORDER BY id
+                   LIMIT %s
+               ), copied AS (
+                   INSERT INTO user_lesson_progress_partitioned (user_id, lesson_id, completed, completed_at)
+                   SELECT user_id, lesson_id, completed, completed_at
+                   FROM batch
+                   WHERE user_id IS NOT NULL AND lesson_id IS NOT NULL
+                   ON CONFLICT (user_id, lesson_id) DO NOTHING
+                   RETURNING 1
+               )
+               SELECT (SELECT MAX(id) FROM batch), (SELECT COUNT(*) FROM copied)""",
+            (after_id, batch_size)
+        )
+        last_id, copied = cur.fetchone()
+        conn.commit()
+
+        result = {
+            'action': action,
+            'copied': copied,
+            'lastId': last_id if last_id is not None else after_id,
+            'done': last_id is None
+        }
+    elif action == 'swap':
+        cur.execute(
+            """SELECT (SELECT COUNT(*) FROM user_lesson_progress
+                       WHERE user_id IS NOT NULL AND lesson_id IS NOT NULL),
+                      (SELECT COUNT(*) FROM user_lesson_progress_partitioned)"""
+        )
+        legacy_count, partitioned_count = cur.fetchone()
+
+        if legacy_count != partitioned_count:
+            cur.close()
+            conn.close()
+            return {
+                'statusCode': 409,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({
+                    'error': 'Backfill is not complete',
+                    'legacyCount': legacy_count,
+                    'partitionedCount': partitioned_count
+                })
+            }
+
+        cur.execute("SET LOCAL lock_timeout = '5s'")
+        cur.execute("LOCK TABLE user_lesson_progress IN ACCESS EXCLUSIVE MODE")
+        cur.execute("DROP TRIGGER user_lesson_progress_sync ON user_lesson_progress")
+        cur.execute("ALTER TABLE user_lesson_progress RENAME TO user_lesson_progress_legacy")
+        cur.execute("ALTER TABLE user_lesson_progress_partitioned RENAME TO user_lesson_progress")
+        conn.commit()
+
+        result = {'action': action, 'swapped': True, 'rows': partitioned_count}
+    elif action == 'deactivate':
+        user_ids = body_data.get('userIds')
+
+        if not isinstance(user_ids, list) or not user_ids or not all(isinstance(i, int) for i in user_ids):
+            cur.close()
+            conn.close()
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'error': 'userIds must be a non-empty list of ids'})
+            }
+
+        if int(user_id) in user_ids:
+            cur.close()
+            conn.close()
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'error': 'Cannot deactivate your own account'})
+            }
+
+        cur.execute(
+            """UPDATE users
+               SET is_active = false, deactivated_at = CURRENT_TIMESTAMP
+               WHERE id = ANY(%s) AND is_active = true""",
+            (user_ids,)
+        )
+        deactivated = cur.rowcount
+        conn.commit()
+
+        result = {'action': action, 'deactivated': deactivated}
+    elif action == 'archive':
+        retention_days = int(body_data.get('retentionDays', 180))
+        batch_users = int(body_data.get('batchUsers', 100))
+
+        cur.execute(
+            """WITH departed AS (
+                   SELECT u.id
+                   FROM users u
+                   WHERE u.is_active = false
+                     AND u.deactivated_at < CURRENT_TIMESTAMP - make_interval(days => %s)
+                     AND EXISTS (SELECT 1 FROM user_lesson_progress ulp WHERE ulp.user_id = u.id)
+                   LIMIT %s
+               ), moved AS (
+                   DELETE FROM user_lesson_progress ulp
+                   USING departed d
+                   WHERE ulp.user_id = d.id
+                   RETURNING ulp.user_id, ulp.lesson_id, ulp.completed, ulp.completed_at
+               )
+               INSERT INTO user_lesson_progress_archive (user_id, lesson_id, completed, completed_at)
+               SELECT user_id, lesson_id, completed, completed_at FROM moved""",
+            (retention_days, batch_users)
+        )
+        archived = cur.rowcount
+        conn.commit()
+
+        result = {'action': action, 'archived': archived, 'done': archived == 0}
+    elif action == 'rollup':
+        cur.execute(
+            "SELECT last_event_id FROM activity_rollup_state WHERE name = 'learning_events' FOR UPDATE"
+        )
+        last_id = cur.fetchone()[0]
+
+        # A transaction still open may commit an event with a lower id than ones already visible, so stop
+        # before events inserted after the oldest open writing transaction began. Only client transactions
+        # that have written hold an xid; the one-minute margin covers an insert that has not got one yet.
+        # Read this before the batch query takes its snapshot, so a transaction is either seen here or
+        # already committed there.
+        cur.execute(
+            """SELECT LEAST(
+                   clock_timestamp() - interval '1 minute',
+                   (SELECT MIN(xact_start) FROM pg_stat_activity
+                    WHERE datname = current_database()
+                      AND backend_type = 'client backend'
+                      AND backend_xid IS NOT NULL
+                      AND pid <> pg_backend_pid())
+               )"""
+        )
+        recorded_before = cur.fetchone()[0]
+
+        cur.execute(
+            """WITH candidate AS (
+                   SELECT id, recorded_at
+                   FROM learning_events
+                   WHERE id > %s
+                   ORDER BY id
+                   LIMIT %s
+               ), settled AS (
+                   SELECT id FROM candidate
+                   WHERE id < COALESCE(
+                       (SELECT MIN(id) FROM candidate WHERE recorded_at >= %s),
+                       9223372036854775807
+                   )
+               )
+               SELECT MAX(id), COUNT(*) FROM settled""",
+            (last_id, batch_size, recorded_before)
+        )
+        upper_id, event_count = cur.fetchone()
+
+        if upper_id is not None:
+            cur.execute(
+                """WITH batch AS (
+                       SELECT user_id, event_type, occurred_at::date AS day
+                       FROM learning_events
+                       WHERE id > %s AND id <= %s
+                   ), new_learners AS (
+                       INSERT INTO activity_daily_learners (day, user_id)
+                       SELECT DISTINCT day, user_id FROM batch
+                       ON CONFLICT DO NOTHING
+                       RETURNING day
+                   ), learner_counts AS (
+                       SELECT day, COUNT(*) AS active_learners FROM new_learners GROUP BY day
+                   ), event_counts AS (
+                       SELECT day,
+                              COUNT(*) FILTER (WHERE event_type = 'login') AS logins,
+                              COUNT(*) FILTER (WHERE event_type = 'course_view') AS course_views,
+                              COUNT(*) FILTER (WHERE event_type = 'lesson_complete') AS lesson_completions
+                       FROM batch
+                       GROUP BY day
+                   )
+                   INSERT INTO activity_daily_rollup (day, active_learners, logins, course_views, lesson_completions)
+                   SELECT e.day, COALESCE(l.active_learners, 0), e.logins, e.course_views, e.lesson_completions
+                   FROM event_counts e
+                   LEFT JOIN learner_counts l ON l.day = e.day
+                   ON CONFLICT (day) DO UPDATE SET
+                       active_learners = activity_daily_rollup.active_learners + EXCLUDED.active_learners,
+                       logins = activity_daily_rollup.logins + EXCLUDED.logins,
+                       course_views = activity_daily_rollup.course_views + EXCLUDED.course_views,
+                       lesson_completions = activity_daily_rollup.lesson_completions + EXCLUDED.lesson_completions""",
+                (last_id, upper_id)
+            )
+            cur.execute(
+                """WITH batch AS (
+                       SELECT user_id, course_id, lesson_id, occurred_at
+                       FROM learning_events
+                       WHERE id > %s AND id <= %s
+                         AND event_type = 'lesson_complete' AND lesson_id IS NOT NULL
+                   ), firsts AS (
+                       INSERT INTO activity_lesson_learners (lesson_id, user_id, first_completed_at)
+                       SELECT lesson_id, user_id, MIN(occurred_at) FROM batch GROUP BY lesson_id, user_id
+                       ON CONFLICT DO NOTHING
+                       RETURNING lesson_id, user_id, first_completed_at
+                   ), first_counts AS (
+                       SELECT f.first_completed_at::date AS day, f.lesson_id,
+                              COUNT(*) AS new_learners,
+                              COALESCE(SUM(GREATEST(EXTRACT(EPOCH FROM f.first_completed_at - ucp.started_at), 0)), 0)::bigint AS seconds
+                       FROM firsts f
+                       JOIN lessons l ON l.id = f.lesson_id
+                       LEFT JOIN user_course_progress ucp ON ucp.user_id = f.user_id AND ucp.course_id = l.course_id
+                       GROUP BY 1, 2
+                   ), completion_counts AS (
+                       SELECT occurred_at::date AS day, lesson_id, MAX(course_id) AS course_id, COUNT(*) AS completions
+                       FROM batch
+                       GROUP BY 1, 2
+                   )
+                   INSERT INTO lesson_daily_rollup (day, lesson_id, course_id, completions, new_learners, total_seconds_to_complete)
+                   SELECT c.day, c.lesson_id, c.course_id, c.completions, COALESCE(f.new_learners, 0), COALESCE(f.seconds, 0)
+                   FROM completion_counts c
+                   LEFT JOIN first_counts f ON f.day = c.day AND f.lesson_id = c.lesson_id
+                   ON CONFLICT (day, lesson_id) DO UPDATE SET
+                       completions = lesson_daily_rollup.completions + EXCLUDED.completions,
+                       new_learners = lesson_daily_rollup.new_learners + EXCLUDED.new_learners,
+                       total_seconds_to_complete = lesson_daily_rollup.total_seconds_to_complete + EXCLUDED.total_seconds_to_complete""",
+                (last_id, upper_id)
+            )
+            cur.execute(
+                """UPDATE activity_rollup_state
+                   SET last_event_id = %s, updated_at = CURRENT_TIMESTAMP
+                   WHERE name = 'learning_events'""",
+                (upper_id,)
+            )
+        conn.commit()
+
+        result = {
+            'action': action,
+            'rolledUp': event_count,
+            'lastEventId': upper_id if upper_id is not None else last_id,
+            'done': event_count < batch_size
+        }
+    else:
+        cur.close()
+        conn.close()
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({'error': 'action must be backfill, swap, deactivate, archive or rollup'})
+        }
+
+    cur.close()
+    conn.close()
+
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'isBase64Encoded': False,
+        'body': json.dumps(result)
+    }
@@ -8,6 +8,40 @@ import json
 import os
 import psycopg2
 from typing import Dict, Any
+from sql_registry import StatementRegistry
+from read_routing import connect_for_read, write_lsn, write_headers
+
+STATEMENTS = StatementRegistry({
+    'progress_course': """SELECT ucp.progress_percent, ucp.started_at, ucp.completed_at,
+                                 c.title, c.cover_image, ucp.due_date, ucp.is_mandatory
+                          FROM user_course_progress ucp
+                          JOIN courses c ON ucp.course_id = c.id
+                          WHERE ucp.user_id = $1 AND ucp.course_id = $2""",
+    'progress_list': """SELECT c.id, c.title, c.cover_image, ucp.progress_percent, ucp.started_at,
+                               ucp.due_date, ucp.is_mandatory
+                        FROM user_course_progress ucp
+                        JOIN courses c ON ucp.course_id = c.id
+                        WHERE ucp.user_id = $1
+                        ORDER BY COALESCE(ucp.started_at, ucp.assigned_at) DESC""",
+    'progress_enroll': """INSERT INTO user_course_progress (user_id, course_id, started_at)
+                          VALUES ($1, $2, CURRENT_TIMESTAMP)
+                          ON CONFLICT (user_id, course_id)
+                          DO UPDATE SET started_at = CURRENT_TIMESTAMP
+                          WHERE user_course_progress.started_at IS NULL""",
+    'progress_complete_lesson': """INSERT INTO user_lesson_progress (user_id, lesson_id, completed, completed_at)
+                                   VALUES ($1, $2, true, CURRENT_TIMESTAMP)
+                                   ON CONFLICT (user_id, lesson_id)
+                                   DO UPDATE SET completed = true, completed_at = CURRENT_TIMESTAMP""",
+    'progress_total_lessons': "SELECT COUNT(*) FROM lessons WHERE course_id = $1",
+    'progress_completed_lessons': """SELECT COUNT(*) FROM user_lesson_progress
+                                     WHERE user_id = $1 AND lesson_id IN (SELECT id FROM lessons WHERE course_id = $2)
+                                     AND completed = true""",
+    'progress_set_percent': """UPDATE user_course_progress
+                               SET progress_percent = $1
+                               WHERE user_id = $2 AND course_id = $3""",
+    'progress_log_completion': """INSERT INTO learning_events (user_id, event_type, course_id, lesson_id)
+                                  VALUES ($1, 'lesson_complete', $2, $3)"""
+})
 
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     method: str = event.get('httpMethod', 'GET')
@@ -18,7 +52,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'headers': {
                 'Access-Control-Allow-Origin': '*',
                 'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
-                'Access-Control-Allow-Headers': 'Content-Type, X-User-Id',
+                'Access-Control-Allow-Headers': 'Content-Type, X-User-Id, X-Read-After-Lsn',
                 'Access-Control-Max-Age': '86400'
             },
             'body': ''
@@ -34,7 +68,10 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'body': json.dumps({'error': 'User ID required'})
         }
     
-    conn = psycopg2.connect(os.environ['DATABASE_URL'])
+    if method == 'GET':
+        conn = connect_for_read(event)
+    else:
+        conn = psycopg2.connect(os.environ['DATABASE_URL'])
     cur = conn.cursor()
     
     if method == 'GET':
@@ -42,14 +79,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         course_id = params.get('courseId')
         
         if course_id:
-            cur.execute(
-                """SELECT ucp.progress_percent, ucp.started_at, ucp.completed_at,
-                          c.title, c.cover_image
-                   FROM user_course_progress ucp
-                   JOIN courses c ON ucp.course_id = c.id
-                   WHERE ucp.user_id = %s AND ucp.course_id = %s""",
-                (user_id, course_id)
-            )
+            STATEMENTS.execute(conn, cur, 'progress_course', (user_id, course_id))
             progress = cur.fetchone()
             
             if progress:
@@ -58,19 +88,14 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                     'startedAt': progress[1].isoformat() if progress[1] else None,
                     'completedAt': progress[2].isoformat() if progress[2] else None,
                     'courseTitle': progress[3],
-                    'coverImage': progress[4]
+                    'coverImage': progress[4],
+                    'dueDate': progress[5].isoformat() if progress[5] else None,
+                    'isMandatory': progress[6]
                 }
             else:
                 result = {'progressPercent': 0}
         else:
-            cur.execute(
-                """SELECT c.id, c.title, c.cover_image, ucp.progress_percent, ucp.started_at
-                   FROM user_course_progress ucp
-                   JOIN courses c ON ucp.course_id = c.id
-                   WHERE ucp.user_id = %s
-                   ORDER BY ucp.started_at DESC""",
-                (user_id,)
-            )
+            STATEMENTS.execute(conn, cur, 'progress_list', (user_id,))
             courses = cur.fetchall()
             
             result = [{
@@ -78,7 +103,9 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 'title': c[1],
                 'coverImage': c[2],
                 'progressPercent': c[3],
-                'startedAt': c[4].isoformat() if c[4] else None
+                'startedAt': c[4].isoformat() if c[4] else None,
+                'dueDate': c[5].isoformat() if c[5] else None,
+                'isMandatory': c[6]
             } for c in courses]
         
         cur.close()
@@ -106,49 +133,30 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 'body': json.dumps({'error': 'courseId and lessonId required'})
             }
         
-        cur.execute(
-            """INSERT INTO user_course_progress (user_id, course_id)
-               VALUES (%s, %s)
-               ON CONFLICT (user_id, course_id) DO NOTHING""",
-            (user_id, course_id)
-        )
+        STATEMENTS.execute(conn, cur, 'progress_enroll', (user_id, course_id))
         
         if completed:
-            cur.execute(
-                """INSERT INTO user_lesson_progress (user_id, lesson_id, completed, completed_at)
-                   VALUES (%s, %s, true, CURRENT_TIMESTAMP)
-                   ON CONFLICT (user_id, lesson_id) 
-                   DO UPDATE SET completed = true, completed_at = CURRENT_TIMESTAMP""",
-                (user_id, lesson_id)
-            )
+            STATEMENTS.execute(conn, cur, 'progress_complete_lesson', (user_id, lesson_id))
+            STATEMENTS.execute(conn, cur, 'progress_log_completion', (user_id, course_id, lesson_id))
         
-        cur.execute("SELECT COUNT(*) FROM lessons WHERE course_id = %s", (course_id,))
+        STATEMENTS.execute(conn, cur, 'progress_total_lessons', (course_id,))
         total_lessons = cur.fetchone()[0]
         
-        cur.execute(
-            """SELECT COUNT(*) FROM user_lesson_progress
-               WHERE user_id = %s AND lesson_id IN (SELECT id FROM lessons WHERE course_id = %s)
-               AND completed = true""",
-            (user_id, course_id)
-        )
+        STATEMENTS.execute(conn, cur, 'progress_completed_lessons', (user_id, course_id))
         completed_lessons = cur.fetchone()[0]
         
         progress_percent = int((completed_lessons / total_lessons) * 100) if total_lessons > 0 else 0
         
-        cur.execute(
-            """UPDATE user_course_progress
-               SET progress_percent = %s
-               WHERE user_id = %s AND course_id = %s""",
-            (progress_percent, user_id, course_id)
-        )
+        STATEMENTS.execute(conn, cur, 'progress_set_percent', (progress_percent, user_id, course_id))
         
         conn.commit()
         cur.close()
+        lsn = write_lsn(conn)
         conn.close()
         
         return {
             'statusCode': 200,
-            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*', **write_headers(lsn)},
             'isBase64Encoded': False,
             'body': json.dumps({'progressPercent': progress_percent})
         }
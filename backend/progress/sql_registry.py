@@ -0,0 +1,98 @@
+'''
+Business: Registry of hot SQL statements prepared once per database connection
+Args: statement name to SQL text ($1, $2 placeholders); execute() takes connection, cursor, name and params
+Returns: Cursor positioned on the statement result; per-statement call counts and timings via stats()
+'''
+
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional, Sequence, Set
+
+# invalid_sql_statement_name: the session lost the statement (DISCARD ALL, pooler reset)
+# feature_not_supported: "cached plan must not change result type" after a schema change
+# duplicate_prepared_statement: the session already has it under this name
+REPREPARE_SQLSTATES = ('26000', '0A000', '42P05')
+
+TRANSACTION_STATUS_IDLE = 0
+
+# Guards registry statements inside a caller's transaction so a failure can be undone and retried
+SAVEPOINT = 'sql_registry'
+
+
+def _sqlstate(error: Exception) -> Optional[str]:
+    return getattr(error, 'pgcode', None) or getattr(error, 'sqlstate', None)
+
+
+class StatementRegistry:
+    def __init__(self, statements: Dict[str, str]):
+        self._statements = statements
+        self._prepared: 'weakref.WeakKeyDictionary[Any, Set[str]]' = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._calls: Dict[str, int] = {name: 0 for name in statements}
+        self._total_seconds: Dict[str, float] = {name: 0.0 for name in statements}
+
+    def execute(self, conn: Any, cur: Any, name: str, params: Optional[Sequence[Any]] = None) -> None:
+        '''Run a registered statement by name, preparing it first on a connection that has not seen it.'''
+        with self._lock:
+            prepared = self._prepared.setdefault(conn, set())
+
+        execute_sql = f"EXECUTE {name} ({', '.join(['%s'] * len(params))})" if params else f"EXECUTE {name}"
+        started = time.perf_counter()
+
+        if name not in prepared:
+            # PREPARE outlives a rolled back transaction, so it is tracked on its own, not with the EXECUTE
+            self._prepare(conn, cur, name)
+            prepared.add(name)
+
+        try:
+            self._run(conn, cur, execute_sql, params)
+        except Exception as e:
+            sqlstate = _sqlstate(e)
+            if sqlstate not in REPREPARE_SQLSTATES:
+                raise
+            prepared.discard(name)
+            self._prepare(conn, cur, name, replace=sqlstate != '26000')
+            prepared.add(name)
+            self._run(conn, cur, execute_sql, params)
+
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._calls[name] += 1
+            self._total_seconds[name] += elapsed
+
+    def _prepare(self, conn: Any, cur: Any, name: str, replace: bool = False) -> None:
+        prepare_sql = f"PREPARE {name} AS {self._statements[name]}"
+        try:
+            self._run(conn, cur, f"DEALLOCATE {name}; {prepare_sql}" if replace else prepare_sql)
+        except Exception as e:
+            if _sqlstate(e) != '42P05':
+                raise
+            self._run(conn, cur, f"DEALLOCATE {name}; {prepare_sql}")
+
+    def _run(self, conn: Any, cur: Any, sql: str, params: Optional[Sequence[Any]] = None) -> None:
+        '''Run sql; if it fails, put the caller's transaction back as it was before the call and re-raise.'''
+        if conn.get_transaction_status() == TRANSACTION_STATUS_IDLE:
+            try:
+                cur.execute(sql, params)
+            except Exception:
+                conn.rollback()
+                raise
+            return
+
+        # The savepoint shares the round trip with the statement; the last result stays on the cursor
+        try:
+            cur.execute(f"SAVEPOINT {SAVEPOINT}; {sql}", params)
+        except Exception:
+            cur.execute(f"ROLLBACK TO SAVEPOINT {SAVEPOINT}")
+            raise
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                name: {
+                    'calls': self._calls[name],
+                    'totalMs': round(self._total_seconds[name] * 1000, 3)
+                }
+                for name in self._statements
+            }
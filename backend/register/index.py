@@ -28,6 +28,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         body_data = json.loads(event.get('body', '{}'))
         phone = body_data.get('phone', '')
         full_name = body_data.get('fullName', '')
+        department = (body_data.get('department') or '').strip() or None
         
         if not phone or not full_name:
             return {
@@ -52,8 +53,8 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             }
         
         cur.execute(
-            "INSERT INTO users (phone, full_name, role) VALUES (%s, %s, 'student') RETURNING id, phone, full_name, role",
-            (phone, full_name)
+            "INSERT INTO users (phone, full_name, role, department) VALUES (%s, %s, 'student', %s) RETURNING id, phone, full_name, role, department",
+            (phone, full_name, department)
         )
         user = cur.fetchone()
         conn.commit()
@@ -62,7 +63,8 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'userId': user[0],
             'phone': user[1],
             'fullName': user[2],
-            'role': user[3]
+            'role': user[3],
+            'department': user[4]
         }
         
         cur.close()
@@ -0,0 +1,15 @@
+-- Add department to users for group course assignment
+ALTER TABLE users ADD COLUMN department VARCHAR(255);
+
+CREATE INDEX idx_users_department ON users(department);
+
+-- Track mandatory assignments on enrollment rows
+ALTER TABLE user_course_progress ADD COLUMN assigned_at TIMESTAMP;
+ALTER TABLE user_course_progress ADD COLUMN assigned_by INTEGER REFERENCES users(id);
+ALTER TABLE user_course_progress ADD COLUMN due_date DATE;
+ALTER TABLE user_course_progress ADD COLUMN is_mandatory BOOLEAN DEFAULT false;
+
+-- Assigned courses are not started until the first lesson is completed
+ALTER TABLE user_course_progress ALTER COLUMN started_at DROP DEFAULT;
+
+CREATE INDEX idx_user_course_progress_course_id ON user_course_progress(course_id);
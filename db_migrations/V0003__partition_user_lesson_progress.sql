@@ -0,0 +1,82 @@
+-- Mark employees who have left the company
+ALTER TABLE users ADD COLUMN is_active BOOLEAN NOT NULL DEFAULT true;
+ALTER TABLE users ADD COLUMN deactivated_at TIMESTAMP;
+
+CREATE INDEX idx_users_deactivated_at ON users(deactivated_at) WHERE is_active = false;
+
+-- Hash-partitioned replacement for user_lesson_progress.
+-- Every query filters by user_id, so each one touches a single partition.
+CREATE TABLE user_lesson_progress_partitioned (
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    lesson_id INTEGER NOT NULL REFERENCES lessons(id),
+    completed BOOLEAN DEFAULT false,
+    completed_at TIMESTAMP,
+    PRIMARY KEY (user_id, lesson_id)
+) PARTITION BY HASH (user_id);
+
+CREATE TABLE user_lesson_progress_p00 PARTITION OF user_lesson_progress_partitioned
+    FOR VALUES WITH (MODULUS 16, REMAINDER 0);
+CREATE TABLE user_lesson_progress_p01 PARTITION OF user_lesson_progress_partitioned
+    FOR VALUES WITH (MODULUS 16, REMAINDER 1);
+CREATE TABLE user_lesson_progress_p02 PARTITION OF user_lesson_progress_partitioned
+    FOR VALUES WITH (MODULUS 16, REMAINDER 2);
+CREATE TABLE user_lesson_progress_p03 PARTITION OF user_lesson_progress_partitioned
+    FOR VALUES WITH (MODULUS 16, REMAINDER 3);
+CREATE TABLE user_lesson_progress_p04 PARTITION OF user_lesson_progress_partitioned
+    FOR VALUES WITH (MODULUS 16, REMAINDER 4);
+CREATE TABLE user_lesson_progress_p05 PARTITION OF user_lesson_progress_partitioned
+    FOR VALUES WITH (MODULUS 16, REMAINDER 5);
+CREATE TABLE user_lesson_progress_p06 PARTITION OF user_lesson_progress_partitioned
+    FOR VALUES WITH (MODULUS 16, REMAINDER 6);
+CREATE TABLE user_lesson_progress_p07 PARTITION OF user_lesson_progress_partitioned
+    FOR VALUES WITH (MODULUS 16, REMAINDER 7);
+CREATE TABLE user_lesson_progress_p08 PARTITION OF user_lesson_progress_partitioned
+    FOR VALUES WITH (MODULUS 16, REMAINDER 8);
+CREATE TABLE user_lesson_progress_p09 PARTITION OF user_lesson_progress_partitioned
+    FOR VALUES WITH (MODULUS 16, REMAINDER 9);
+CREATE TABLE user_lesson_progress_p10 PARTITION OF user_lesson_progress_partitioned
+    FOR VALUES WITH (MODULUS 16, REMAINDER 10);
+CREATE TABLE user_lesson_progress_p11 PARTITION OF user_lesson_progress_partitioned
+    FOR VALUES WITH (MODULUS 16, REMAINDER 11);
+CREATE TABLE user_lesson_progress_p12 PARTITION OF user_lesson_progress_partitioned
+    FOR VALUES WITH (MODULUS 16, REMAINDER 12);
+CREATE TABLE user_lesson_progress_p13 PARTITION OF user_lesson_progress_partitioned
+    FOR VALUES WITH (MODULUS 16, REMAINDER 13);
+CREATE TABLE user_lesson_progress_p14 PARTITION OF user_lesson_progress_partitioned
+    FOR VALUES WITH (MODULUS 16, REMAINDER 14);
+CREATE TABLE user_lesson_progress_p15 PARTITION OF user_lesson_progress_partitioned
+    FOR VALUES WITH (MODULUS 16, REMAINDER 15);
+
+-- Mirror live writes into the partitioned table until the maintenance swap
+CREATE FUNCTION sync_user_lesson_progress() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        DELETE FROM user_lesson_progress_partitioned
+        WHERE user_id = OLD.user_id AND lesson_id = OLD.lesson_id;
+        RETURN OLD;
+    END IF;
+
+    IF NEW.user_id IS NOT NULL AND NEW.lesson_id IS NOT NULL THEN
+        INSERT INTO user_lesson_progress_partitioned (user_id, lesson_id, completed, completed_at)
+        VALUES (NEW.user_id, NEW.lesson_id, NEW.completed, NEW.completed_at)
+        ON CONFLICT (user_id, lesson_id)
+        DO UPDATE SET completed = EXCLUDED.completed, completed_at = EXCLUDED.completed_at;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER user_lesson_progress_sync
+    AFTER INSERT OR UPDATE OR DELETE ON user_lesson_progress
+    FOR EACH ROW EXECUTE FUNCTION sync_user_lesson_progress();
+
+-- Cold storage for progress of employees who have left
+CREATE TABLE user_lesson_progress_archive (
+    user_id INTEGER NOT NULL,
+    lesson_id INTEGER NOT NULL,
+    completed BOOLEAN,
+    completed_at TIMESTAMP,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_user_lesson_progress_archive_user_id ON user_lesson_progress_archive(user_id);
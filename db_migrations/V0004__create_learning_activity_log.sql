@@ -0,0 +1,57 @@
+-- Append-only learning activity events (login, course_view, lesson_complete)
+CREATE TABLE learning_events (
+    id BIGSERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    event_type VARCHAR(30) NOT NULL,
+    course_id INTEGER,
+    lesson_id INTEGER,
+    occurred_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    recorded_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Handlers buffer events, so occurred_at is when it happened and recorded_at when it was inserted
+CREATE INDEX idx_learning_events_occurred_at ON learning_events USING BRIN (occurred_at);
+
+-- Position of the incremental rollup in learning_events
+CREATE TABLE activity_rollup_state (
+    name VARCHAR(50) PRIMARY KEY,
+    last_event_id BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO activity_rollup_state (name, last_event_id) VALUES ('learning_events', 0);
+
+-- Distinct learners seen per day, used to count daily active learners incrementally
+CREATE TABLE activity_daily_learners (
+    day DATE NOT NULL,
+    user_id INTEGER NOT NULL,
+    PRIMARY KEY (day, user_id)
+);
+
+-- First completion of each lesson per learner, used for drop-off and time to complete
+CREATE TABLE activity_lesson_learners (
+    lesson_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    first_completed_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (lesson_id, user_id)
+);
+
+CREATE TABLE activity_daily_rollup (
+    day DATE PRIMARY KEY,
+    active_learners INTEGER NOT NULL DEFAULT 0,
+    logins INTEGER NOT NULL DEFAULT 0,
+    course_views INTEGER NOT NULL DEFAULT 0,
+    lesson_completions INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE lesson_daily_rollup (
+    day DATE NOT NULL,
+    lesson_id INTEGER NOT NULL,
+    course_id INTEGER,
+    completions INTEGER NOT NULL DEFAULT 0,
+    new_learners INTEGER NOT NULL DEFAULT 0,
+    total_seconds_to_complete BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, lesson_id)
+);
+
+CREATE INDEX idx_lesson_daily_rollup_course_id ON lesson_daily_rollup(course_id);
@@ -0,0 +1,2 @@
+-- CURRENT_TIMESTAMP is the start of the inserting transaction; the rollup cutoff needs the insert time
+ALTER TABLE learning_events ALTER COLUMN recorded_at SET DEFAULT clock_timestamp();
@@ -0,0 +1,52 @@
+#!/usr/bin/env bash
+# Start or stop a local primary and streaming replica for testing DATABASE_READ_URL routing.
+#   local-server/replication.sh start   # prints DATABASE_URL and DATABASE_READ_URL
+#   local-server/replication.sh stop
+set -euo pipefail
+
+PG_BIN=${PG_BIN:-$(pg_config --bindir)}
+DATA_DIR=${DATA_DIR:-/tmp/lms-replication}
+PRIMARY_PORT=${PRIMARY_PORT:-5432}
+REPLICA_PORT=${REPLICA_PORT:-5433}
+MIGRATIONS_DIR="$(cd "$(dirname "$0")/.." && pwd)/db_migrations"
+
+start() {
+    mkdir -p "$DATA_DIR"
+
+    "$PG_BIN/initdb" -D "$DATA_DIR/primary" -U postgres -A trust -E UTF8 > "$DATA_DIR/initdb.log"
+    cat >> "$DATA_DIR/primary/postgresql.conf" <<CONF
+listen_addresses = 'localhost'
+wal_level = replica
+max_wal_senders = 4
+hot_standby = on
+CONF
+    "$PG_BIN/pg_ctl" -D "$DATA_DIR/primary" -l "$DATA_DIR/primary.log" -w \
+        -o "-p $PRIMARY_PORT -k $DATA_DIR" start
+
+    "$PG_BIN/createdb" -h localhost -p "$PRIMARY_PORT" -U postgres lms
+    for migration in "$MIGRATIONS_DIR"/*.sql; do
+        "$PG_BIN/psql" -q -v ON_ERROR_STOP=1 -h localhost -p "$PRIMARY_PORT" -U postgres -d lms -f "$migration"
+    done
+
+    "$PG_BIN/pg_basebackup" -h localhost -p "$PRIMARY_PORT" -U postgres -D "$DATA_DIR/replica" -R -X stream
+    "$PG_BIN/pg_ctl" -D "$DATA_DIR/replica" -l "$DATA_DIR/replica.log" -w \
+        -o "-p $REPLICA_PORT -k $DATA_DIR" start
+
+    echo "export DATABASE_URL=postgresql://postgres@localhost:$PRIMARY_PORT/lms"
+    echo "export DATABASE_READ_URL=postgresql://postgres@localhost:$REPLICA_PORT/lms"
+}
+
+stop() {
+    for node in replica primary; do
+        if [ -d "$DATA_DIR/$node" ]; then
+            "$PG_BIN/pg_ctl" -D "$DATA_DIR/$node" -m fast stop || true
+        fi
+    done
+    rm -rf "$DATA_DIR"
+}
+
+case "${1:-}" in
+    start) start ;;
+    stop) stop ;;
+    *) echo "usage: $0 start|stop" >&2; exit 1 ;;
+esac
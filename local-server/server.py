@@ -0,0 +1,377 @@
+'''
+Business: Local asyncio HTTP server hosting every backend function in one process
+Args: --host, --port, --workers, --pool-min, --pool-max; DATABASE_URL in the environment
+Returns: Serves backend/<name>/index.py at /api/<name> and /<name>
+
+Requests are translated into the same event dict the cloud runtime passes to
+handler(event, context). Handlers run on a worker thread pool and their
+psycopg2.connect() calls are served from a shared psycopg 3 async connection
+pool per DSN, so all database I/O is multiplexed on the event loop.
+'''
+
+import argparse
+import asyncio
+import base64
+import importlib.util
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+import uuid
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from http import HTTPStatus
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import psycopg
+from psycopg import AsyncClientCursor, pq
+from psycopg_pool import AsyncConnectionPool
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+MAX_BODY_BYTES = 10 * 1024 * 1024
+# An unreachable DSN (e.g. a replica that is down) fails fast, and the failure is reused for a while
+POOL_OPEN_TIMEOUT_SECONDS = 5.0
+POOL_RETRY_SECONDS = 10.0
+
+Handler = Callable[[Dict[str, Any], Any], Dict[str, Any]]
+
+
+class PooledCursor:
+    '''psycopg2-style cursor whose calls run on the server event loop.'''
+
+    def __init__(self, conn: 'PooledConnection', cursor: Any):
+        self._conn = conn
+        self._cursor = cursor
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    @property
+    def description(self) -> Any:
+        return self._cursor.description
+
+    def execute(self, query: str, params: Any = None) -> None:
+        self._conn.run(self._execute(query, params))
+
+    async def _execute(self, query: str, params: Any) -> None:
+        await self._cursor.execute(query, params)
+        # Like psycopg2, expose the result of the last statement in the query
+        while self._cursor.nextset():
+            pass
+
+    def fetchone(self) -> Optional[Tuple[Any, ...]]:
+        return self._conn.run(self._cursor.fetchone())
+
+    def fetchall(self) -> List[Tuple[Any, ...]]:
+        return self._conn.run(self._cursor.fetchall())
+
+    def close(self) -> None:
+        self._conn.run(self._cursor.close())
+
+
+class PooledConnection:
+    '''psycopg2-style connection borrowed from an async pool; close() returns it.
+
+    The same object is handed out every time its pooled connection is checked
+    out, so per-connection state kept by handlers (prepared statements) survives.
+    '''
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, pool: AsyncConnectionPool):
+        self._loop = loop
+        self._pool = pool
+        self._raw: Any = None
+        self._lease = 0
+
+    def attach(self, raw: Any) -> int:
+        self._raw = raw
+        self._lease += 1
+        return self._lease
+
+    def release(self, lease: int) -> None:
+        '''Close the connection if it is still checked out under this lease.'''
+        if self._lease == lease:
+            self.close()
+
+    def run(self, coro: Coroutine[Any, Any, Any]) -> Any:
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    @property
+    def closed(self) -> bool:
+        return self._raw is None
+
+    def cursor(self) -> PooledCursor:
+        return PooledCursor(self, self._raw.cursor())
+
+    def commit(self) -> None:
+        self.run(self._raw.commit())
+
+    def rollback(self) -> None:
+        self.run(self._raw.rollback())
+
+    def get_transaction_status(self) -> int:
+        return int(self._raw.info.transaction_status)
+
+    def close(self) -> None:
+        if self._raw is None:
+            return
+        raw, self._raw = self._raw, None
+        if raw.info.transaction_status != pq.TransactionStatus.IDLE:
+            self.run(raw.rollback())
+        self.run(self._pool.putconn(raw))
+
+
+class PooledDatabase:
+    '''Stands in for the psycopg2 module inside hosted handlers.'''
+
+    # DB-API exceptions handlers may catch as psycopg2.<Name>
+    Error = psycopg.Error
+    DatabaseError = psycopg.DatabaseError
+    DataError = psycopg.DataError
+    OperationalError = psycopg.OperationalError
+    IntegrityError = psycopg.IntegrityError
+    ProgrammingError = psycopg.ProgrammingError
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, min_size: int, max_size: int):
+        self._loop = loop
+        self._min_size = min_size
+        self._max_size = max_size
+        self._pools: Dict[str, 'Future[AsyncConnectionPool]'] = {}
+        self._pool_failed_at: Dict[str, float] = {}
+        self._connections: 'weakref.WeakKeyDictionary[Any, PooledConnection]' = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def connect(self, dsn: str) -> PooledConnection:
+        pool = self._pool_for(dsn)
+        raw = asyncio.run_coroutine_threadsafe(pool.getconn(), self._loop).result()
+        with self._lock:
+            conn = self._connections.get(raw)
+            if conn is None:
+                conn = PooledConnection(self._loop, pool)
+                self._connections[raw] = conn
+        lease = conn.attach(raw)
+        acquired = getattr(self._local, 'acquired', None)
+        if acquired is not None:
+            acquired.append((conn, lease))
+        return conn
+
+    def invoke(self, handler: Handler, event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+        '''Run a handler on a worker thread, returning leaked connections to the pool.'''
+        self._local.acquired = []
+        try:
+            return handler(event, context)
+        finally:
+            for conn, lease in self._local.acquired:
+                conn.release(lease)
+            self._local.acquired = None
+
+    async def close(self) -> None:
+        for opening in self._pools.values():
+            if opening.done() and opening.exception() is None:
+                await opening.result().close()
+
+    def _pool_for(self, dsn: str) -> AsyncConnectionPool:
+        # Only starting the open is serialized; threads wait on the per-DSN future without the lock
+        with self._lock:
+            opening = self._pools.get(dsn)
+            failed_at = self._pool_failed_at.get(dsn)
+            if opening is None or (failed_at is not None and time.monotonic() - failed_at >= POOL_RETRY_SECONDS):
+                opening = asyncio.run_coroutine_threadsafe(self._open_pool(dsn), self._loop)
+                self._pools[dsn] = opening
+                self._pool_failed_at.pop(dsn, None)
+        try:
+            return opening.result()
+        except Exception:
+            with self._lock:
+                if self._pools.get(dsn) is opening:
+                    self._pool_failed_at.setdefault(dsn, time.monotonic())
+            raise
+
+    async def _open_pool(self, dsn: str) -> AsyncConnectionPool:
+        # Client-side binding keeps psycopg2 semantics for the handlers' %s queries
+        pool = AsyncConnectionPool(
+            dsn,
+            min_size=self._min_size,
+            max_size=self._max_size,
+            kwargs={'cursor_factory': AsyncClientCursor},
+            open=False
+        )
+        await pool.open(wait=True, timeout=POOL_OPEN_TIMEOUT_SECONDS)
+        return pool
+
+
+def load_handlers(backend_dir: Path, database: PooledDatabase) -> Tuple[Dict[str, Handler], Dict[str, Any]]:
+    '''Import every backend/<name>/index.py with psycopg2 routed to the shared pool.
+
+    Returns the handlers and the prepared statement registries of the functions that have one.
+    '''
+    sys.modules['psycopg2'] = database  # type: ignore[assignment]
+    handlers: Dict[str, Handler] = {}
+    registries: Dict[str, Any] = {}
+
+    for index in sorted(backend_dir.glob('*/index.py')):
+        function_dir = index.parent
+        module_name = 'backend_' + function_dir.name.replace('-', '_')
+        before = set(sys.modules)
+        sys.path.insert(0, str(function_dir))
+        try:
+            spec = importlib.util.spec_from_file_location(module_name, index)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        finally:
+            sys.path.remove(str(function_dir))
+            # Each function ships its own copy of helper modules; forget them so
+            # the next function imports from its own directory
+            for name in set(sys.modules) - before:
+                module_file = getattr(sys.modules[name], '__file__', None)
+                if module_file and Path(module_file).parent == function_dir:
+                    del sys.modules[name]
+
+        handlers[function_dir.name] = module.handler
+        if hasattr(module, 'STATEMENTS'):
+            registries[function_dir.name] = module.STATEMENTS
+
+    return handlers, registries
+
+
+class LocalServer:
+    def __init__(self, handlers: Dict[str, Handler], registries: Dict[str, Any], database: PooledDatabase, executor: ThreadPoolExecutor):
+        self._handlers = handlers
+        self._registries = registries
+        self._database = database
+        self._executor = executor
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body, keep_alive = request
+                status, response_headers, response_body = await self._dispatch(method, target, headers, body)
+                self._write_response(writer, status, response_headers, response_body, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes, bool]]:
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+        method, target, version = request_line.decode('latin-1').split()
+
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip()] = value.strip()
+
+        lower = {k.lower(): v for k, v in headers.items()}
+        length = int(lower.get('content-length', 0))
+        if length > MAX_BODY_BYTES:
+            raise ValueError('Request body too large')
+        body = await reader.readexactly(length) if length else b''
+
+        connection = lower.get('connection', '').lower()
+        keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+        return method, target, headers, body, keep_alive
+
+    async def _dispatch(self, method: str, target: str, headers: Dict[str, str], body: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        url = urlsplit(target)
+        parts = [p for p in url.path.split('/') if p]
+        if parts and parts[0] == 'api':
+            parts = parts[1:]
+        if parts == ['__stats', 'statements'] and method == 'GET':
+            stats = {name: registry.stats() for name, registry in self._registries.items()}
+            return 200, {'Content-Type': 'application/json'}, json.dumps(stats).encode()
+        handler = self._handlers.get(parts[0]) if parts else None
+
+        if handler is None:
+            return 404, {'Content-Type': 'application/json'}, json.dumps({'error': 'Function not found'}).encode()
+
+        event: Dict[str, Any] = {
+            'httpMethod': method,
+            'path': '/' + '/'.join(parts[1:]),
+            'headers': headers,
+            'queryStringParameters': dict(parse_qsl(url.query)),
+            'isBase64Encoded': False
+        }
+        if body:
+            event['body'] = body.decode('utf-8')
+        context = SimpleNamespace(request_id=str(uuid.uuid4()), function_name=parts[0])
+
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self._executor, self._database.invoke, handler, event, context)
+        except Exception:
+            traceback.print_exc()
+            return 500, {'Content-Type': 'application/json'}, json.dumps({'error': 'Internal server error'}).encode()
+
+        response_body = result.get('body', '')
+        if result.get('isBase64Encoded'):
+            payload = base64.b64decode(response_body)
+        else:
+            payload = response_body.encode('utf-8') if isinstance(response_body, str) else response_body
+        return result.get('statusCode', 200), dict(result.get('headers', {})), payload
+
+    def _write_response(self, writer: asyncio.StreamWriter, status: int, headers: Dict[str, str], body: bytes, keep_alive: bool) -> None:
+        try:
+            reason = HTTPStatus(status).phrase
+        except ValueError:
+            reason = ''
+        headers['Content-Length'] = str(len(body))
+        headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+        head = f'HTTP/1.1 {status} {reason}\r\n' + ''.join(f'{k}: {v}\r\n' for k, v in headers.items()) + '\r\n'
+        writer.write(head.encode('latin-1') + body)
+
+
+async def serve(args: argparse.Namespace) -> None:
+    loop = asyncio.get_running_loop()
+    database = PooledDatabase(loop, args.pool_min, args.pool_max)
+    handlers, registries = load_handlers(Path(args.backend_dir), database)
+    executor = ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix='handler')
+    app = LocalServer(handlers, registries, database, executor)
+
+    server = await asyncio.start_server(app.handle_client, args.host, args.port, backlog=4096)
+    print(f"Serving {', '.join(sorted(handlers))} on http://{args.host}:{args.port}/api/<function>")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        await database.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Run all backend functions in one asyncio process')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=64, help='Handler threads running concurrently')
+    parser.add_argument('--pool-min', type=int, default=2, help='Minimum pooled connections per DSN')
+    parser.add_argument('--pool-max', type=int, default=20, help='Maximum pooled connections per DSN')
+    parser.add_argument('--backend-dir', default=str(BACKEND_DIR))
+    args = parser.parse_args()
+
+    if 'DATABASE_URL' not in os.environ:
+        parser.error('DATABASE_URL must be set')
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
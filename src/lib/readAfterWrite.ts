@@ -0,0 +1,28 @@
+const STORAGE_KEY = 'readAfterLsn';
+const WINDOW_MS = 5 * 60 * 1000;
+
+interface StoredLsn {
+  lsn: string;
+  savedAt: number;
+}
+
+export const readAfterWrite = {
+  remember(response: Response): void {
+    const lsn = response.headers.get('X-Write-Lsn');
+    if (lsn) {
+      localStorage.setItem(STORAGE_KEY, JSON.stringify({ lsn, savedAt: Date.now() }));
+    }
+  },
+
+  headers(): Record<string, string> {
+    const storedStr = localStorage.getItem(STORAGE_KEY);
+    if (!storedStr) return {};
+
+    const stored: StoredLsn = JSON.parse(storedStr);
+    if (Date.now() - stored.savedAt > WINDOW_MS) {
+      localStorage.removeItem(STORAGE_KEY);
+      return {};
+    }
+    return { 'X-Read-After-Lsn': stored.lsn };
+  }
+};
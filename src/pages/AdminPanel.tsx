@@ -8,6 +8,7 @@ import { Switch } from '@/components/ui/switch';
 import Icon from '@/components/ui/icon';
 import { toast } from 'sonner';
 import { authService } from '@/lib/auth';
+import { readAfterWrite } from '@/lib/readAfterWrite';
 
 interface AdminCourse {
   id: number;
@@ -38,7 +39,7 @@ const AdminPanel = () => {
 
     try {
       const response = await fetch('/api/admin-courses', {
-        headers: { 'X-User-Id': user.userId.toString() }
+        headers: { 'X-User-Id': user.userId.toString(), ...readAfterWrite.headers() }
       });
       
       if (response.ok) {
@@ -71,6 +72,7 @@ const AdminPanel = () => {
       });
 
       if (response.ok) {
+        readAfterWrite.remember(response);
         setCourses(courses.map(c => 
           c.id === courseId ? { ...c, isPublished: !isPublished } : c
         ));
@@ -9,6 +9,7 @@ import { Accordion, AccordionContent, AccordionItem, AccordionTrigger } from '@/
 import Icon from '@/components/ui/icon';
 import { toast } from 'sonner';
 import { authService } from '@/lib/auth';
+import { readAfterWrite } from '@/lib/readAfterWrite';
 
 interface Lesson {
   id: number;
@@ -46,7 +47,12 @@ const CourseDetail = () => {
 
   const loadCourse = async () => {
     try {
-      const response = await fetch(`/api/courses?id=${id}`);
+      const response = await fetch(`/api/courses?id=${id}`, {
+        headers: {
+          ...(user && { 'X-User-Id': user.userId.toString() }),
+          ...readAfterWrite.headers()
+        }
+      });
       const data = await response.json();
       
       if (response.ok) {
@@ -67,7 +73,7 @@ const CourseDetail = () => {
 
     try {
       const response = await fetch(`/api/progress?courseId=${id}`, {
-        headers: { 'X-User-Id': user.userId.toString() }
+        headers: { 'X-User-Id': user.userId.toString(), ...readAfterWrite.headers() }
       });
       
       if (response.ok) {
@@ -97,6 +103,7 @@ const CourseDetail = () => {
       });
 
       if (response.ok) {
+        readAfterWrite.remember(response);
         const data = await response.json();
         setCompletedLessons(prev => new Set(prev).add(lessonId));
         setProgress(data.progressPercent);
@@ -10,6 +10,7 @@ import { Tabs, TabsContent, TabsList, TabsTrigger } from '@/components/ui/tabs';
 import Icon from '@/components/ui/icon';
 import { toast } from 'sonner';
 import { authService } from '@/lib/auth';
+import { readAfterWrite } from '@/lib/readAfterWrite';
 
 interface Lesson {
   id?: number;
@@ -50,7 +51,9 @@ const CourseEditor = () => {
 
   const loadCourse = async () => {
     try {
-      const response = await fetch(`/api/courses?id=${id}`);
+      const response = await fetch(`/api/courses?id=${id}`, {
+        headers: readAfterWrite.headers()
+      });
       if (response.ok) {
         const data = await response.json();
         setTitle(data.title);
@@ -89,6 +92,7 @@ const CourseEditor = () => {
       });
 
       if (response.ok) {
+        readAfterWrite.remember(response);
         const data = await response.json();
         toast.success(id ? 'Курс обновлен' : 'Курс создан');
         if (!id) {
@@ -128,6 +132,7 @@ const CourseEditor = () => {
       });
 
       if (response.ok) {
+        readAfterWrite.remember(response);
         const data = await response.json();
         setLessons([...lessons, data]);
         setCurrentLesson({
@@ -6,6 +6,7 @@ import { Button } from '@/components/ui/button';
 import { Badge } from '@/components/ui/badge';
 import Icon from '@/components/ui/icon';
 import { toast } from 'sonner';
+import { readAfterWrite } from '@/lib/readAfterWrite';
 
 interface Course {
   id: number;
@@ -27,7 +28,9 @@ const Courses = () => {
 
   const loadCourses = async () => {
     try {
-      const response = await fetch('/api/courses');
+      const response = await fetch('/api/courses', {
+        headers: readAfterWrite.headers()
+      });
       const data = await response.json();
       
       if (response.ok) {
@@ -7,13 +7,16 @@ import { Button } from '@/components/ui/button';
 import Icon from '@/components/ui/icon';
 import { toast } from 'sonner';
 import { authService } from '@/lib/auth';
+import { readAfterWrite } from '@/lib/readAfterWrite';
 
 interface CourseProgress {
   courseId: number;
   title: string;
   coverImage: string;
   progressPercent: number;
-  startedAt: string;
+  startedAt: string | null;
+  dueDate: string | null;
+  isMandatory: boolean;
 }
 
 const ProgressPage = () => {
@@ -34,7 +37,7 @@ const ProgressPage = () => {
 
     try {
       const response = await fetch('/api/progress', {
-        headers: { 'X-User-Id': user.userId.toString() }
+        headers: { 'X-User-Id': user.userId.toString(), ...readAfterWrite.headers() }
       });
       
       if (response.ok) {
@@ -85,8 +88,15 @@ const ProgressPage = () => {
                 <CardHeader>
                   <CardTitle className="text-lg">{course.title}</CardTitle>
                   <p className="text-xs text-muted-foreground">
-                    Начат {new Date(course.startedAt).toLocaleDateString('ru-RU')}
+                    {course.startedAt
+                      ? `Начат ${new Date(course.startedAt).toLocaleDateString('ru-RU')}`
+                      : 'Назначен, не начат'}
                   </p>
+                  {course.dueDate && (
+                    <p className="text-xs text-muted-foreground">
+                      Срок до {new Date(course.dueDate).toLocaleDateString('ru-RU')}
+                    </p>
+                  )}
                 </CardHeader>
                 <CardContent className="space-y-4">
                   <div>
@@ -101,7 +111,7 @@ const ProgressPage = () => {
                     className="w-full"
                     onClick={() => navigate(`/course/${course.courseId}`)}
                   >
-                    {course.progressPercent === 100 ? 'Повторить' : 'Продолжить'}
+                    {course.progressPercent === 100 ? 'Повторить' : course.startedAt ? 'Продолжить' : 'Начать'}
                     <Icon name="ArrowRight" className="w-4 h-4 ml-2" />
                   </Button>
                 </CardContent>
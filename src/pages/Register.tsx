@@ -10,6 +10,7 @@ import Icon from '@/components/ui/icon';
 const Register = () => {
   const [phone, setPhone] = useState('');
   const [fullName, setFullName] = useState('');
+  const [department, setDepartment] = useState('');
   const [isLoading, setIsLoading] = useState(false);
   const navigate = useNavigate();
 
@@ -25,7 +26,7 @@ const Register = () => {
       const response = await fetch('/api/register', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ phone, fullName })
+        body: JSON.stringify({ phone, fullName, department: department.trim() || null })
       });
 
       const data = await response.json();
@@ -65,6 +66,16 @@ const Register = () => {
             />
           </div>
 
+          <div className="space-y-2">
+            <label className="text-sm font-medium">Отдел</label>
+            <Input
+              type="text"
+              placeholder="Продажи"
+              value={department}
+              onChange={(e) => setDepartment(e.target.value)}
+            />
+          </div>
+
           <div className="space-y-2">
             <label className="text-sm font-medium">Номер телефона</label>
             <Input